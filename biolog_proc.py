@@ -7,26 +7,19 @@ import pandas as pd # type: ignore
 import time
 from datetime import datetime
 import os
-import re
+import openpyxl # type: ignore
 from scipy.integrate import simpson # type: ignore
 from scipy.stats import ttest_rel # type: ignore
-import random
-random.seed(42)
-from scipy.optimize import curve_fit # type: ignore
+from scipy.stats import qmc # type: ignore
+from numba import njit, prange # type: ignore
 import argparse
-from sklearn.metrics import r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
-# sort the columns using the custom key
+# sort the columns using the custom key; well labels are always a row letter
+# followed by a column number, so plain slicing beats a regex
 def custom_sort_key(column):
-    match = re.match(r"([A-Z]+)(\d+)", column)
-    if match:
-        return (match.group(1), int(match.group(2)))
-
-#   find the longest string
-def longest_string(strings):
-    return max(strings, key=len)
+    return (column[0], int(column[1:]))
 
 #   custom type function to enforce a float range
 def float_in_range(min_val, max_val):
@@ -53,45 +46,191 @@ def integer_in_range(min_val, max_val):
     return range_checker
 
 
-#   two growth curve models are defined
-def Gompertz_growth_model(x, A, lag, mu):
+#   two growth curve models are defined, compiled with numba so that the tens of
+#   thousands of evaluations made during fitting run as machine code
+@njit(cache=True, fastmath=True)
+def _Gompertz_growth_model_jit(x, A, lag, mu):
     return A*np.exp(-np.exp(mu*np.exp(1)/A*(lag-x)+1))
 
-def Logistic_growth_model(x, A, lag, mu):
+@njit(cache=True, fastmath=True)
+def _Logistic_growth_model_jit(x, A, lag, mu):
     return A/(1+np.exp(4*mu/A*(lag-x)+2))
 
-#   get R2 coefficient between observed growth curve and the best model fit
-def get_r2_coef(function, popt, x, y):
-    y_pred = function(x, *popt)
-    return r2_score(y_pred=y_pred, y_true=y)
-
-#   fitting growth curve model parameters
-def fit_model_parameters(xdata, ydata, model):
-    init_guess = [random.random(), random.random(), random.random()]
-    try:
-        if model == 'Logistic':
-            best_fits, covar = curve_fit(
-                Logistic_growth_model,
-                xdata,
-                ydata,
-                p0=init_guess,
-                bounds = ([0,0,0], [np.inf,xdata[-1],10]),
-                maxfev=10000
-            )
-            r2 = get_r2_coef(Logistic_growth_model, best_fits, xdata, ydata)
-        elif model == 'Gompertz':
-            best_fits, covar = curve_fit(
-                Gompertz_growth_model,
-                xdata,
-                ydata,
-                p0=init_guess,
-                bounds = ([0,0,0], [np.inf,xdata[-1],10]),
-                maxfev=10000
-            )
-            r2 = get_r2_coef(Gompertz_growth_model, best_fits, xdata, ydata)
-        return True, best_fits, r2
-    except:
-        return False, [np.nan] * len(init_guess), np.nan
+#   thin python wrappers keep the (x, A, lag, mu) call signature
+def Gompertz_growth_model(x, A, lag, mu):
+    return _Gompertz_growth_model_jit(np.asarray(x, dtype=float), A, lag, mu)
+
+def Logistic_growth_model(x, A, lag, mu):
+    return _Logistic_growth_model_jit(np.asarray(x, dtype=float), A, lag, mu)
+
+#   warm up the JIT once at import time so the first fit does not pay the compilation cost
+_Gompertz_growth_model_jit(np.zeros(2), 1.0, 1.0, 1.0)
+_Logistic_growth_model_jit(np.zeros(2), 1.0, 1.0, 1.0)
+
+#   model value and analytic jacobian with respect to (A, lag, mu); model_id 0 is Logistic, 1 is Gompertz
+@njit(cache=True, error_model="numpy")
+def _model_value_and_jacobian(x, A, lag, mu, model_id):
+    n = len(x)
+    f = np.empty(n)
+    jac = np.empty((n, 3))
+    if model_id == 0:
+        for i in range(n):
+            e = np.exp(4*mu/A*(lag-x[i])+2)
+            denom = (1+e)**2
+            f[i] = A/(1+e)
+            jac[i, 0] = 1/(1+e) + e/denom*4*mu*(lag-x[i])/A
+            jac[i, 1] = -4*mu*e/denom
+            jac[i, 2] = -4*(lag-x[i])*e/denom
+    else:
+        E = np.exp(1)
+        for i in range(n):
+            eu = np.exp(mu*E/A*(lag-x[i])+1)
+            g = np.exp(-eu)
+            f[i] = A*g
+            jac[i, 0] = g*(1 + eu*mu*E*(lag-x[i])/A)
+            jac[i, 1] = -mu*E*eu*g
+            jac[i, 2] = -E*(lag-x[i])*eu*g
+    return f, jac
+
+#   exception-free 3x3 linear solve (Cramer's rule); returns nan on a singular system
+#   so that callers inside parallel regions never have to catch LinAlgError
+@njit(cache=True, error_model="numpy")
+def _solve3(m, v):
+    det = (m[0,0]*(m[1,1]*m[2,2] - m[1,2]*m[2,1])
+           - m[0,1]*(m[1,0]*m[2,2] - m[1,2]*m[2,0])
+           + m[0,2]*(m[1,0]*m[2,1] - m[1,1]*m[2,0]))
+    out = np.empty(3)
+    if det == 0 or not np.isfinite(det):
+        out[:] = np.nan
+        return out
+    out[0] = (v[0]*(m[1,1]*m[2,2] - m[1,2]*m[2,1])
+              - m[0,1]*(v[1]*m[2,2] - m[1,2]*v[2])
+              + m[0,2]*(v[1]*m[2,1] - m[1,1]*v[2]))/det
+    out[1] = (m[0,0]*(v[1]*m[2,2] - m[1,2]*v[2])
+              - v[0]*(m[1,0]*m[2,2] - m[1,2]*m[2,0])
+              + m[0,2]*(m[1,0]*v[2] - v[1]*m[2,0]))/det
+    out[2] = (m[0,0]*(m[1,1]*v[2] - v[1]*m[2,1])
+              - m[0,1]*(m[1,0]*v[2] - v[1]*m[2,0])
+              + v[0]*(m[1,0]*m[2,1] - m[1,1]*m[2,0]))/det
+    return out
+
+#   bounded Levenberg-Marquardt least squares for the two 3-parameter growth models
+@njit(cache=True, error_model="numpy")
+def _lm_fit(x, y, p0, lo, hi, model_id, max_iter=50):
+    p = np.minimum(np.maximum(p0, lo), hi)
+    f, jac = _model_value_and_jacobian(x, p[0], p[1], p[2], model_id)
+    resid = f - y
+    ssq = np.sum(resid**2)
+    lam = 1e-3
+    for _ in range(max_iter):
+        jtj = jac.T @ jac
+        jtr = jac.T @ resid
+        # damped normal equations; the small floor keeps the system nonsingular
+        damped = jtj + lam*(np.diag(np.diag(jtj)) + 1e-12*np.eye(3))
+        step = _solve3(damped, -jtr)
+        p_new = np.minimum(np.maximum(p + step, lo), hi)
+        f_new, jac_new = _model_value_and_jacobian(x, p_new[0], p_new[1], p_new[2], model_id)
+        resid_new = f_new - y
+        ssq_new = np.sum(resid_new**2)
+        if np.isfinite(ssq_new) and (ssq_new < ssq):
+            if (ssq - ssq_new) < 1e-12*(1 + ssq):
+                p, ssq = p_new, ssq_new
+                break
+            p, resid, jac, ssq = p_new, resid_new, jac_new, ssq_new
+            lam = max(lam/3, 1e-12)
+        else:
+            lam = min(lam*5, 1e12)
+    return np.isfinite(ssq), p, ssq
+
+#   warm up the JIT once at import time so the first fit does not pay the compilation cost
+_lm_fit(np.arange(4.0), np.arange(4.0), np.full(3, 0.5), np.zeros(3), np.full(3, 10.0), 0)
+_lm_fit(np.arange(4.0), np.arange(4.0), np.full(3, 0.5), np.zeros(3), np.full(3, 10.0), 1)
+
+#   fit every (well, replicate) growth curve of a plate in one compiled pass;
+#   wells run in parallel via prange, replicates within a well run sequentially
+#   so that each fit can warm-start from the previous converged parameters
+@njit(cache=True, parallel=True, error_model="numpy")
+def fit_plate(od_arr, time_axis, rep_time_masks, init_samples, model_id, min_r2, max_trials):
+    n_wells, n_reps, n_times = od_arr.shape
+    sgr = np.empty((n_wells, n_reps))
+    r2 = np.empty((n_wells, n_reps))
+    for i in prange(n_wells):
+        warm_popt = np.empty(3)
+        has_warm = False
+        for j in range(n_reps):
+            # gather this replicate's measured time points and log-relative OD
+            n_pts = int(np.sum(rep_time_masks[j]))
+            xdata = np.empty(n_pts)
+            ydata = np.empty(n_pts)
+            k = 0
+            for t in range(n_times):
+                if rep_time_masks[j, t]:
+                    xdata[k] = time_axis[t]
+                    ydata[k] = od_arr[i, j, t]
+                    k += 1
+            y0 = ydata[0]
+            for k in range(n_pts):
+                ydata[k] = np.log(ydata[k]/y0)
+            ss_tot = np.sum((ydata - np.mean(ydata))**2)
+
+            lower_bounds = np.zeros(3)
+            upper_bounds = np.array([np.inf, xdata[-1], 10.0])
+
+            # seed with the previous converged parameters, then fall back to Sobol
+            # restarts; the first trial reaching min_r2 short-circuits the rest
+            max_r2 = 0.0
+            best_popt = np.full(3, np.nan)
+            n = 0
+            while max_r2 < min_r2 and n < max_trials:
+                init_guess = warm_popt if (n == 0 and has_warm) else init_samples[i, n]
+                converged, popt, ssq = _lm_fit(xdata, ydata, init_guess, lower_bounds, upper_bounds, model_id)
+                if converged:
+                    # R2 comes for free from the converged sum of squared residuals
+                    if ss_tot == 0:
+                        trial_r2 = 1.0 if ssq == 0 else 0.0
+                    else:
+                        trial_r2 = 1.0 - ssq/ss_tot
+                    if trial_r2 > max_r2:
+                        max_r2 = trial_r2
+                        best_popt = popt
+                n += 1
+            if max_r2 >= min_r2:
+                sgr[i, j] = best_popt[2] # A, lag, mu
+                warm_popt = best_popt
+                has_warm = True
+            else:
+                sgr[i, j] = np.nan
+            r2[i, j] = max_r2
+    return sgr, r2
+
+#   scrambled Sobol initial guesses for every well of a plate, seeded per well so
+#   results are reproducible; A in [0,1], lag up to the end of the time axis, mu up to 10
+def sobol_init_samples(n_wells, time_axis, max_trials):
+    return np.stack([
+        qmc.scale(qmc.Sobol(d=3, scramble=True, seed=42 + i).random(max_trials), [0.0, 0.0, 0.0], [1.0, time_axis[-1], 10.0])
+        for i in range(n_wells)
+    ])
+
+#   warm up the JIT once at import time so the first plate does not pay the compilation cost
+fit_plate(np.ones((1, 1, 3)), np.arange(3.0), np.ones((1, 3), dtype=np.bool_), np.full((1, 1, 3), 0.5), 0, 0.0, 1)
+
+#   resolve the negative control for every well of a plate up front, so the metric
+#   computations stay branchless: well i is compared against all_wells[neg_ctr_idx[i]]
+#   (A1, or F1 for the second half of plate PM4A)
+def negative_control_indices(all_wells, plate):
+    neg_ctr_idx = np.full(len(all_wells), all_wells.index('A1'))
+    if (plate == 'PM4A') and ('F1' in all_wells):
+        f1_pos = all_wells.index('F1')
+        neg_ctr_idx[f1_pos:] = f1_pos
+    is_neg_ctr = (neg_ctr_idx == np.arange(len(all_wells)))
+    return neg_ctr_idx, is_neg_ctr
+
+#   plate-info CSVs are static, so each one is read at most once per process
+_plate_info_cache = {}
+def get_plate_info(plate):
+    if plate not in _plate_info_cache:
+        _plate_info_cache[plate] = pd.read_csv("biolog_plate_info/%s_info.csv"%plate)
+    return _plate_info_cache[plate]
 
 # read input files
 def read_input_data(folder_path):
@@ -103,60 +242,79 @@ def read_input_data(folder_path):
             if file.endswith('.xlsx'):
                 all_file_paths.append(os.path.join(root, file))
 
-    # read data into pandaframes
-    all_data_frames = []
+    # read data as plain arrays; read-only openpyxl streams each workbook once
+    # without building per-cell objects or paying pandas' type inference
+    all_sheet_blocks = [] # one (time, well, od, plate, replicate, strain) block per sheet
     for file_path in all_file_paths:
-        sheet_names = pd.ExcelFile(file_path).sheet_names
-        for sheet_name in sheet_names:
-            # read file
-            df = pd.read_excel(file_path, header=None, sheet_name=sheet_name)
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        for worksheet in workbook.worksheets:
+            sheet_name = worksheet.title
+            rows = list(worksheet.values)
 
             # find the start and end row of biolog data
-            start_row = df[df[0] == 600].index[0] + 2
-            end_row = df[df[0] == 'Results'].index[0] -2
-
-            # get biolog data
-            df = df.iloc[start_row:end_row+1, 1:].drop(2, axis=1).set_index(1)
-            df.columns = df.iloc[0]
-            df = df[1:]
-
-            # rename time
-            datetime1 = datetime.combine(datetime.min, df.index[1])
-            datetime2 = datetime.combine(datetime.min, df.index[0])
+            start_row = next(i for i, row in enumerate(rows) if row[0] == 600) + 2
+            end_row = next(i for i, row in enumerate(rows) if row[0] == 'Results') - 2
+
+            # get biolog data: the header row holds well labels, column 1 holds clock times,
+            # and the OD readings start at column 3 (column 2 is skipped as before)
+            all_wells = [well for well in rows[start_row][3:] if well is not None]
+            n_wells = len(all_wells)
+            data_rows = rows[start_row+1:end_row+1]
+
+            # convert clock times to hours assuming equal spacing
+            datetime1 = datetime.combine(datetime.min, data_rows[1][1])
+            datetime2 = datetime.combine(datetime.min, data_rows[0][1])
             delta_t = (datetime1 - datetime2).total_seconds()/3600
-            df = df.rename({df.index[i]:i*delta_t for i in range(len(df))})
-            df.index.name = None
-
-            # unstack data frame
-            df = df.stack().reset_index()
-            df.columns = ['Time','Well','OD']
 
-            # append metadata
-            plate = sheet_name.split('_')[0]
-            replicate = sheet_name.split('_')[1]
-            strain = sheet_name.split('_')[2]
-            df['Plate'] = plate
-            df['Replicate'] = replicate
-            df['Strain'] = strain
-
-            # save data
-            all_data_frames.append(df)
-
-    # merge all data frames into one
-    df_merged = pd.concat(all_data_frames)
+            # long-format columns (time-major, matching the old stack order) plus sheet metadata
+            od = np.array([row[3:3+n_wells] for row in data_rows], dtype=float)
+            plate, replicate, strain = sheet_name.split('_')[:3]
+            all_sheet_blocks.append((
+                np.repeat(np.arange(len(data_rows))*delta_t, n_wells),
+                np.tile(np.array(all_wells, dtype=object), len(data_rows)),
+                od.ravel(),
+                plate,
+                replicate,
+                strain,
+            ))
+        workbook.close()
+
+    # assemble the merged frame once from pre-sized column buffers instead of
+    # concatenating per-sheet data frames
+    n_total = sum(len(block[0]) for block in all_sheet_blocks)
+    time_col = np.empty(n_total)
+    well_col = np.empty(n_total, dtype=object)
+    od_col = np.empty(n_total)
+    plate_col = np.empty(n_total, dtype=object)
+    replicate_col = np.empty(n_total, dtype=object)
+    strain_col = np.empty(n_total, dtype=object)
+    pos = 0
+    for block_time, block_well, block_od, plate, replicate, strain in all_sheet_blocks:
+        nxt = pos + len(block_time)
+        time_col[pos:nxt] = block_time
+        well_col[pos:nxt] = block_well
+        od_col[pos:nxt] = block_od
+        plate_col[pos:nxt] = plate
+        replicate_col[pos:nxt] = replicate
+        strain_col[pos:nxt] = strain
+        pos = nxt
+    df_merged = pd.DataFrame({
+        'Time': time_col,
+        'Well': well_col,
+        'OD': od_col,
+        'Plate': plate_col,
+        'Replicate': replicate_col,
+        'Strain': strain_col,
+    })
 
     # add metabolite name
-    biolog_info = []
-    for plate in set(df_merged.Plate):
-        df_plate = pd.read_csv("biolog_plate_info/%s_info.csv"%plate)
-        biolog_info.append(df_plate)
-    df_biolog_info = pd.concat(biolog_info)
-    df_merged = pd.merge(
-        df_merged,
-        df_biolog_info[['Metabolite','Plate','Well']],
-        left_on=['Plate','Well'],
-        right_on=['Plate','Well'],
-        how='left'
+    df_biolog_info = pd.concat([get_plate_info(plate) for plate in set(df_merged.Plate)])
+
+    # (Plate, Well) -> Metabolite is a small static lookup, so a dict map beats a full hash join
+    metabolite_lookup = {(row.Plate, row.Well): row.Metabolite for row in df_biolog_info.itertuples()}
+    df_merged['Metabolite'] = pd.Series(
+        map(metabolite_lookup.get, zip(df_merged.Plate, df_merged.Well)),
+        index=df_merged.index,
     )
 
     return df_merged[['Strain','Plate','Replicate','Well','Metabolite','Time','OD']]
@@ -182,148 +340,138 @@ if __name__ == "__main__":
     # read input files
     df_input = read_input_data(args.input_path)
 
-    # processing results are stored in res
-    all_res = []
+    # processing results are stored as one block of column arrays per (strain, plate)
+    all_res_blocks = []
+
+    # growth model selection for the compiled fitting kernel
+    model_id = 0 if args.growth_model == 'Logistic' else 1
+
+    # group the merged data frame once so that each well is scanned a single time
+    plate_groups = {key: df_plate for key, df_plate in df_input.groupby(['Strain', 'Plate'], sort=False)}
+
+    # determine end time point as the last common time point across replicates, once per (strain, plate)
+    last_common_time_map = {}
+    for (strain, plate), df_A1 in df_input[df_input.Well=='A1'].groupby(['Strain', 'Plate'], sort=False): # negative control well
+        n_reps = len(set(df_A1.Replicate))
+        occurrence = df_A1['Time'].value_counts() # for each time point, count its number of occurrence in replicates
+        last_common_time_map[(strain, plate)] = max(occurrence[occurrence==n_reps].index) # find the latest time point that occurs in all replicates
 
     # iterate over all combinations of strains, plates, and wells
-    all_strains = list(df_input.drop_duplicates('Strain').Strain)
+    all_strains = list(dict.fromkeys(strain for strain, plate in plate_groups))
     for strain in all_strains:
-        all_plates = list(df_input[df_input.Strain==strain].drop_duplicates('Plate').sort_values('Plate').Plate)
+        all_plates = sorted(plate for s, plate in plate_groups if s == strain)
         for plate in all_plates:
-            # determine end time point as the last common time point across replicates
-            df_A1 = df_input[(df_input.Strain==strain) & (df_input.Plate==plate) & (df_input.Well=='A1')] # negative control well
-            n_reps = len(set(df_A1.Replicate))
-            occurrence = df_A1['Time'].value_counts() # for each time point, count its number of occurrence in replicates
-            last_common_time = max(occurrence[occurrence==n_reps].index) # find the latest time point that occurs in all replicates
-
-            # analyze growth curve for each well
-            neg_ctr_final_od = None # OD at the last time point
-            neg_ctr_auc = None # area under the cruve
-            neg_ctr_sgr = None # specific growth rate
-
-            all_wells = list(df_input[(df_input.Strain==strain) & (df_input.Plate==plate)].drop_duplicates('Well').Well)
-            all_wells = sorted(all_wells, key=custom_sort_key) # make sure that wells are processed from A to H and 1 to 12 in order
-            # print(all_wells)
-            for well in all_wells:
-                df_well = df_input[(df_input.Strain==strain) & (df_input.Plate==plate) & (df_input.Well==well) & (df_input.Time <= last_common_time)]
-                df_well = df_well.sort_values(['Replicate', 'Time'])
-                all_replicates = list(df_well.drop_duplicates('Replicate').sort_values('Replicate').Replicate)
-                metabolite = df_well.Metabolite.values[0]
-                curr_well_res = [strain, plate, well, metabolite, last_common_time]
-
-                #-------------------
-                # end point approach
-                #-------------------
-                curr_well_final_od = df_well[df_well.Time==last_common_time].sort_values('Replicate').OD.to_numpy()
-                curr_well_final_od = np.round(curr_well_final_od.astype(float), 3)
-                if (well == 'A1') or ((plate == 'PM4A') and (well == 'F1')):
-                    neg_ctr_final_od = curr_well_final_od.copy()
-                    fold_change_final_od = [1.0] * len(neg_ctr_final_od)
-                    pvalue_final_od = np.nan
-                else:
-                    fold_change_final_od = curr_well_final_od/neg_ctr_final_od
-                    pvalue_final_od = ttest_rel(curr_well_final_od, neg_ctr_final_od, alternative='greater')[1]
-                curr_well_res.extend([";".join(map(str, curr_well_final_od)), np.mean(curr_well_final_od), np.mean(fold_change_final_od), np.round(pvalue_final_od, 6)])
-
-                #---------------------
-                # area under the curve
-                #---------------------
-                curr_well_auc_list = []
-                for rep in all_replicates:
-                    xdata = df_well[df_well.Replicate==rep].Time.to_numpy()
-                    ydata = df_well[df_well.Replicate==rep].OD.to_numpy()
-                    area = simpson(y=ydata, x=xdata)
-                    curr_well_auc_list.append(area)
-                curr_well_auc = np.array(curr_well_auc_list)
-                curr_well_auc = np.round(curr_well_auc.astype(float), 3)
-                if (well == 'A1') or ((plate == 'PM4A') and (well == 'F1')):
-                    neg_ctr_auc = curr_well_auc.copy()
-                    fold_change_auc = [1.0] * len(neg_ctr_auc)
-                    pvalue_auc = np.nan
-                else:
-                    fold_change_auc = curr_well_auc/neg_ctr_auc
-                    pvalue_auc = ttest_rel(curr_well_auc, neg_ctr_auc, alternative='greater')[1]
-                curr_well_res.extend([";".join(map(str, curr_well_auc)), np.mean(curr_well_auc), np.mean(fold_change_auc), np.round(pvalue_auc, 6)])
-
-                #---------------------------
-                # growth curve model fitting
-                #---------------------------
-                curr_well_sgr_list = []
-                curr_well_r2_list = []
-                for rep in all_replicates:
-                    xdata = df_well[df_well.Replicate==rep].Time.to_numpy().astype(float)
-                    ydata = df_well[df_well.Replicate==rep].OD.to_numpy().astype(float)
-                    log_rely = np.log(ydata/ydata[0])
-
-                    # try random initial guesses
-                    max_r2 = 0
-                    n = 0
-                    while (max_r2 < args.min_r2) & (n < args.max_trials):
-                        _ok, _optp, _r2 = fit_model_parameters(xdata, log_rely, args.growth_model)
-                        if _ok:
-                            optp = _optp
-                            if _r2 > max_r2:
-                                max_r2 = _r2
-                        n += 1
-                    if n < args.max_trials:
-                        curr_well_sgr_list.append(optp[2]) # A, lag, mu
-                    else:
-                        curr_well_sgr_list.append(np.nan)
-                    curr_well_r2_list.append(max_r2)
-
-                curr_well_sgr = np.array(curr_well_sgr_list)
-                curr_well_sgr = np.round(curr_well_sgr.astype(float), 3)
-                curr_well_r2 = np.array(curr_well_r2_list)
-                curr_well_r2 = np.round(curr_well_r2.astype(float), 3)
-                if (well == 'A1') or ((plate == 'PM4A') and (well == 'F1')):
-                    neg_ctr_sgr = curr_well_sgr.copy()
-                    fold_change_sgr = [1.0] * len(neg_ctr_sgr)
-                    pvalue_sgr = np.nan
-                else:
-                    fold_change_sgr = curr_well_sgr/neg_ctr_sgr
-                    # remove nan in both current and A1 well data before calculating p value
-                    non_nan_indices = ~np.isnan(curr_well_sgr) & ~np.isnan(neg_ctr_sgr)
-                    filtered_curr_well_sgr = curr_well_sgr[non_nan_indices]
-                    filtered_neg_ctr_sgr = neg_ctr_sgr[non_nan_indices]
-                    pvalue_sgr = ttest_rel(filtered_curr_well_sgr, filtered_neg_ctr_sgr, alternative='greater')[1]
-                curr_well_res.extend([";".join(map(str, curr_well_r2)), ";".join(map(str, curr_well_sgr)), np.nanmean(curr_well_sgr), np.nanmean(fold_change_sgr), np.round(pvalue_sgr, 6)])
-
-                #-------------
-                # save results
-                #-------------
-                all_res.append(curr_well_res)
-
-    # generate summary in a dataframe
-    df_all_res = pd.DataFrame(all_res,
-                              columns=['Strain','Plate','Well','Metabolite','LastCommonTime',
-                                       'EOD','EOD_Mean','EOD_MeanFC','EOD_Pvalue',
-                                       'AUC','AUC_Mean','AUC_MeanFC','AUC_Pvalue',
-                                       'CurveFit_R2', 'SGR','SGR_Mean','SGR_MeanFC','SGR_Pvalue'
-                                       ])
-
-    # determine growth based on cutoffs
-    growth_status = []
-    for fod_fc, fod_pv, auc_fc, auc_pv, sgr_fc, sgr_pv in zip(df_all_res.EOD_MeanFC, df_all_res.EOD_Pvalue, df_all_res.AUC_MeanFC, df_all_res.AUC_Pvalue, df_all_res.SGR_MeanFC, df_all_res.SGR_Pvalue):
-        status_str = ''
-        if (fod_fc >= args.fc_cutoff) and (fod_pv < args.pvalue_cutoff):
-            status_str += '+'
-        else:
-            status_str += '-'
-        if (auc_fc >= args.fc_cutoff) and (auc_pv < args.pvalue_cutoff):
-            status_str += '+'
-        else:
-            status_str += '-'
-        if (sgr_fc >= args.fc_cutoff) and (sgr_pv < args.pvalue_cutoff):
-            status_str += '+'
-        else:
-            status_str += '-'
-        growth_status.append(status_str)
-    df_all_res['GrowthStatus'] = growth_status
+            last_common_time = last_common_time_map[(strain, plate)]
+
+            df_plate = plate_groups[(strain, plate)]
+            df_plate = df_plate[df_plate.Time <= last_common_time]
+
+            # pivot the plate into a 3D OD array indexed by (well, replicate, time)
+            all_wells = sorted(set(df_plate.Well), key=custom_sort_key) # make sure that wells are processed from A to H and 1 to 12 in order
+            all_replicates = sorted(set(df_plate.Replicate))
+            n_wells, n_reps = len(all_wells), len(all_replicates)
+            pivot = df_plate.pivot(index=['Well','Replicate'], columns='Time', values='OD') # (well, replicate, time) combinations are unique, so a pure reshape suffices
+            pivot = pivot.reindex(pd.MultiIndex.from_product([all_wells, all_replicates]))
+            time_axis = pivot.columns.to_numpy().astype(float)
+            od_arr = pivot.to_numpy().astype(float).reshape(n_wells, n_reps, len(time_axis))
+            metabolite_map = dict(zip(df_plate.Well, df_plate.Metabolite))
+
+            # replicates may be sampled on different time grids, leaving nan gaps in the
+            # pivoted array; keep one mask of measured time points per replicate
+            rep_time_masks = np.vstack([~np.isnan(od_arr[:, j, :]).any(axis=0) for j in range(n_reps)])
+
+            # each well is compared against the negative control well of the plate
+            neg_ctr_idx, is_neg_ctr = negative_control_indices(all_wells, plate)
+
+            #-------------------
+            # end point approach
+            #-------------------
+            final_od = np.round(od_arr[:, :, -1], 3) # OD at the last common time point, (n_wells, n_reps)
+            fold_change_final_od = final_od/final_od[neg_ctr_idx]
+            pvalue_final_od = ttest_rel(final_od, final_od[neg_ctr_idx], axis=1, alternative='greater')[1]
+            pvalue_final_od[is_neg_ctr] = np.nan
+
+            #---------------------
+            # area under the curve
+            #---------------------
+            if rep_time_masks.all():
+                # all replicates share one time grid: integrate the whole plate tensor in a single call
+                auc = simpson(y=od_arr, x=time_axis, axis=-1)
+            else:
+                auc = np.empty((n_wells, n_reps))
+                for j in range(n_reps):
+                    mask = rep_time_masks[j]
+                    auc[:, j] = simpson(y=od_arr[:, j, mask], x=time_axis[mask]) # all wells of one replicate in a single call
+            auc = np.round(auc, 3)
+            fold_change_auc = auc/auc[neg_ctr_idx]
+            pvalue_auc = ttest_rel(auc, auc[neg_ctr_idx], axis=1, alternative='greater')[1]
+            pvalue_auc[is_neg_ctr] = np.nan
+
+            #---------------------------
+            # growth curve model fitting
+            #---------------------------
+            init_samples = sobol_init_samples(n_wells, time_axis, args.max_trials)
+            sgr, r2 = fit_plate(od_arr, time_axis, rep_time_masks, init_samples, model_id, args.min_r2, args.max_trials)
+            sgr = np.round(sgr, 3)
+            r2 = np.round(r2, 3)
+
+            fold_change_sgr = sgr/sgr[neg_ctr_idx]
+            fold_change_sgr[is_neg_ctr] = 1.0 # avoid nan/nan when a control replicate failed to fit
+            # nan_policy='omit' drops replicate pairs where either fit failed, matching the old per-well filtering
+            pvalue_sgr = ttest_rel(sgr, sgr[neg_ctr_idx], axis=1, alternative='greater', nan_policy='omit')[1]
+            pvalue_sgr[is_neg_ctr] = np.nan
+
+            #-------------
+            # save results
+            #-------------
+            all_res_blocks.append({
+                'Strain': np.full(n_wells, strain, dtype=object),
+                'Plate': np.full(n_wells, plate, dtype=object),
+                'Well': np.array(all_wells, dtype=object),
+                'Metabolite': np.array([metabolite_map[well] for well in all_wells], dtype=object),
+                'LastCommonTime': np.full(n_wells, last_common_time),
+                'EOD': np.array([";".join(map(str, row)) for row in final_od], dtype=object),
+                'EOD_Mean': np.mean(final_od, axis=1),
+                'EOD_MeanFC': np.mean(fold_change_final_od, axis=1),
+                'EOD_Pvalue': np.round(pvalue_final_od, 6),
+                'AUC': np.array([";".join(map(str, row)) for row in auc], dtype=object),
+                'AUC_Mean': np.mean(auc, axis=1),
+                'AUC_MeanFC': np.mean(fold_change_auc, axis=1),
+                'AUC_Pvalue': np.round(pvalue_auc, 6),
+                'CurveFit_R2': np.array([";".join(map(str, row)) for row in r2], dtype=object),
+                'SGR': np.array([";".join(map(str, row)) for row in sgr], dtype=object),
+                'SGR_Mean': np.nanmean(sgr, axis=1),
+                'SGR_MeanFC': np.nanmean(fold_change_sgr, axis=1),
+                'SGR_Pvalue': np.round(pvalue_sgr, 6),
+            })
+
+    # generate summary in a dataframe; each column is concatenated from the per-plate
+    # blocks, so no per-row lists are built and no dtype inference pass is needed
+    df_all_res = pd.DataFrame({
+        column: np.concatenate([block[column] for block in all_res_blocks])
+        for column in all_res_blocks[0]
+    })
+
+    # determine growth based on cutoffs; nan fold changes or p-values compare False and yield '-'
+    status_chars = np.array(['-', '+'])
+    eod_positive = (df_all_res.EOD_MeanFC >= args.fc_cutoff) & (df_all_res.EOD_Pvalue < args.pvalue_cutoff)
+    auc_positive = (df_all_res.AUC_MeanFC >= args.fc_cutoff) & (df_all_res.AUC_Pvalue < args.pvalue_cutoff)
+    sgr_positive = (df_all_res.SGR_MeanFC >= args.fc_cutoff) & (df_all_res.SGR_Pvalue < args.pvalue_cutoff)
+    df_all_res['GrowthStatus'] = (status_chars[eod_positive.astype(int)]
+                                  + status_chars[auc_positive.astype(int)]
+                                  + status_chars[sgr_positive.astype(int)])
 
     # compare growth status between strains
     df_sum = df_all_res.copy()
     df_sum = df_sum[['Strain','Plate','Metabolite','GrowthStatus']]
-    df_sum = pd.pivot_table(df_sum, index=['Plate','Metabolite'], columns='Strain', values='GrowthStatus', aggfunc=longest_string).fillna('-')
+    # keep the longest status per (plate, metabolite, strain) via a stable sort and
+    # dedupe instead of a python aggfunc; ties resolve to the first row, as max() did
+    df_sum = (df_sum.assign(_status_len=df_sum.GrowthStatus.str.len())
+                    .sort_values('_status_len', ascending=False, kind='stable')
+                    .drop_duplicates(['Plate','Metabolite','Strain'], keep='first')
+                    .pivot(index=['Plate','Metabolite'], columns='Strain', values='GrowthStatus')
+                    .sort_index()
+                    .fillna('-'))
     df_sum = df_sum[~(df_sum == '---').all(axis=1)]
     all_strains = list(df_sum.columns)
     for strain in all_strains: